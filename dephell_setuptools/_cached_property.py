@@ -6,13 +6,18 @@ class cached_property(object):  # noqa: N801
     """
     A property that is only computed once per instance and then replaces itself
     with an ordinary attribute. Deleting the attribute resets the property.
+
+    There is no locking: after the first access the value is read from the
+    instance dict without calling the descriptor at all. Instances are not
+    thread-safe on the first access, the value can be computed twice.
     """
     def __init__(self, func):
         self.__doc__ = func.__doc__
         self.func = func
+        self.name = func.__name__
 
     def __get__(self, obj, cls):
         if obj is None:
             return self
-        value = obj.__dict__[self.func.__name__] = self.func(obj)
+        value = obj.__dict__[self.name] = self.func(obj)
         return value
@@ -1,13 +1,17 @@
 # built-in
+import atexit
+import distutils.core
+import io
 import json
 import os
+import runpy
 import subprocess
 import sys
-from contextlib import contextmanager
+import threading
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
 from distutils.core import Command
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from typing import Any, Dict
+from typing import Any, Dict, Optional  # noqa: F401
 
 # app
 from ._base import BaseReader
@@ -15,42 +19,162 @@ from ._cached_property import cached_property
 from ._constants import FIELDS
 
 
+# the child interpreter only needs this package to be importable,
+# and PATH for anything that setup.py wants to run
+_ENV = {'PYTHONPATH': str(Path(__file__).resolve().parent.parent)}
+if 'PATH' in os.environ:
+    _ENV['PATH'] = os.environ['PATH']
+_COMMAND_ARGS = ('-q', '--command-packages', 'dephell_setuptools', 'distutils_cmd')
+_WORKER_CMD = (sys.executable, '-m', 'dephell_setuptools._worker')
+# marks the metadata line in stdout, setup.py can print anything around it
+_JSON_PREFIX = 'dephell_setuptools json: '
+
+# the long-living interpreter that runs setup.py files, see `_worker.py`
+_worker = None  # type: Optional[subprocess.Popen]
+_worker_lock = threading.Lock()
+
+
+def get_distribution_data(distribution) -> Dict[str, Any]:
+    data = {}
+    attributes = vars(distribution)
+    for key in FIELDS:
+        # methods take precedence over attributes
+        getter = getattr(distribution, 'get_' + key, None)
+        if getter is not None:
+            value = getter()
+        elif key in attributes:
+            value = attributes[key]
+        else:
+            continue
+        if value in ('UNKNOWN', None, ['UNKNOWN']):
+            continue
+        data[key] = value
+    return data
+
+
+class _SetupCalled(BaseException):
+    """raised by the patched setup() to stop setup.py as soon as it is called
+    """
+    def __init__(self, kwargs: Dict[str, Any]):
+        super().__init__(kwargs)
+        self.kwargs = kwargs
+
+
+def _fake_setup(**kwargs):
+    raise _SetupCalled(kwargs)
+
+
 @contextmanager
-def cd(path: Path):
-    old_path = os.getcwd()
-    os.chdir(str(path))
+def _patch_setup(path: Path):
+    # late import, setuptools is heavy and only needed here
+    import setuptools
+
+    old_setups = setuptools.setup, distutils.core.setup
+    old_cwd = os.getcwd()
+    old_argv = sys.argv
+    old_sys_path = sys.path[:]
+    old_modules = set(sys.modules)
+    setuptools.setup = distutils.core.setup = _fake_setup
+    sys.argv = [path.name]
+    sys.path.insert(0, str(path.parent))
     try:
+        os.chdir(str(path.parent))
         yield
     finally:
-        os.chdir(old_path)
+        setuptools.setup, distutils.core.setup = old_setups
+        os.chdir(old_cwd)
+        sys.argv = old_argv
+        sys.path[:] = old_sys_path
+        # forget modules imported from the project, the next one can have the same names
+        for name in set(sys.modules) - old_modules:
+            del sys.modules[name]
+
+
+def get_setup_data(path: Path) -> Dict[str, Any]:
+    """run setup.py in the current interpreter and return its metadata
+    """
+    output = io.StringIO()
+    with _patch_setup(path):
+        with redirect_stdout(output), redirect_stderr(output):
+            try:
+                runpy.run_path(path.name, run_name='__main__')
+            except _SetupCalled as e:
+                attrs = e.kwargs
+            else:
+                raise LookupError('setup() was not called')
+            # do what setup() does up to running commands
+            # to get the same values as the command would
+            from setuptools.dist import Distribution
+            distribution = attrs.pop('distclass', Distribution)(attrs)
+            distribution.parse_config_files()
+    return get_distribution_data(distribution)
+
+
+def _get_worker() -> subprocess.Popen:
+    global _worker
+    if _worker is None or _worker.poll() is not None:
+        _worker = subprocess.Popen(
+            _WORKER_CMD,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=_ENV,
+            universal_newlines=True,
+        )
+    return _worker
+
+
+@atexit.register
+def _stop_worker() -> None:
+    if _worker is not None and _worker.poll() is None:
+        # the worker exits when its input is closed
+        _worker.communicate()
 
 
 class CommandReader(BaseReader):
     @cached_property
     def content(self) -> Dict[str, Any]:
-        # generate a temporary json file which contains the metadata
-        output_json = NamedTemporaryFile()
-        cmd = [
-            sys.executable,
-            self.path.name,
-            '-q',
-            '--command-packages', 'dephell_setuptools',
-            'distutils_cmd',
-            '-o', output_json.name,
-        ]
-        with cd(self.path.parent):
-            result = subprocess.run(
-                cmd,
-                stderr=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                env={'PYTHONPATH': str(Path(__file__).parent.parent)},
-            )
+        try:
+            content = self._run_in_worker()
+        # setup.py can raise anything or break when it is not launched as a script,
+        # fall back to running it as a script.
+        except Exception:  # noqa: B902
+            content = self._run_in_subprocess()
+        return self._clean(content)
+
+    def _run_in_worker(self) -> Dict[str, Any]:
+        with _worker_lock:
+            worker = _get_worker()
+            assert worker.stdin is not None and worker.stdout is not None
+            worker.stdin.write(str(self.path.resolve()) + '\n')
+            worker.stdin.flush()
+            response = worker.stdout.readline()
+        if not response:
+            raise RuntimeError('worker has died')
+        response = json.loads(response)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response['result']
+
+    def _run_in_subprocess(self) -> Dict[str, Any]:
+        cmd = (sys.executable, self.path.name) + _COMMAND_ARGS
+        result = subprocess.run(
+            cmd,
+            stderr=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=_ENV,
+            cwd=str(self.path.parent),
+        )
+        # decode only the last line, the output can be long
         if result.returncode != 0:
-            raise RuntimeError(result.stderr.decode().strip().split('\n')[-1])
+            line = result.stderr.rstrip().rsplit(b'\n', 1)[-1]
+            raise RuntimeError(line.decode('utf8', errors='replace').strip())
 
-        with open(output_json.name) as stream:
-            content = json.load(stream)
-        return self._clean(content)
+        prefix = _JSON_PREFIX.encode()
+        for line in reversed(result.stdout.splitlines()):
+            if line.startswith(prefix):
+                return json.loads(line[len(prefix):].decode('utf8'))
+        raise LookupError('cannot find metadata in the command output')
 
 
 class JSONCommand(Command):
@@ -58,7 +182,7 @@ class JSONCommand(Command):
     """
 
     description = 'extract package metadata'
-    user_options = [('output=', 'o', 'output for metadata json')]
+    user_options = [('output=', 'o', 'output for metadata json (stdout by default)')]
 
     def initialize_options(self):
         self.output = None
@@ -67,31 +191,9 @@ class JSONCommand(Command):
         pass
 
     def run(self):
-        data = dict()
-
-        # attributes
-        for key, value in vars(self.distribution).items():
-            if key not in FIELDS:
-                continue
-            if key == 'entry_points' and isinstance(value, dict):
-                for k, v in value.items():
-                    if isinstance(v, set):
-                        value[k] = list(v)
-            if value in ('UNKNOWN', None, ['UNKNOWN']):
-                continue
-            data[key] = value
-
-        # methods
-        for func_name in dir(self.distribution):
-            if not func_name.startswith('get_'):
-                continue
-            name = func_name[4:]
-            if name not in FIELDS:
-                continue
-            value = getattr(self.distribution, func_name)()
-            if value in ('UNKNOWN', None, ['UNKNOWN']):
-                continue
-            data[name] = value
-
+        data = get_distribution_data(self.distribution)
+        if self.output is None:
+            print(_JSON_PREFIX + json.dumps(data))
+            return
         with open(self.output, 'w') as stream:
             print(json.dumps(data), file=stream)
@@ -1,7 +1,7 @@
 
 
 # https://setuptools.readthedocs.io/en/latest/setuptools.html#metadata
-FIELDS = {
+FIELDS = frozenset({
     'author_email',
     'author',
     'classifiers',
@@ -24,8 +24,7 @@ FIELDS = {
     'platforms',
     'project_urls',
     'provides',
-    'provides',
     'requires',
     'url',
     'version',
-}
+})
@@ -1,49 +1,56 @@
 # built-in
 import ast
-from typing import Any, Dict, Optional
+import re
+import sys
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type  # noqa: F401
 
 # app
 from ._base import BaseReader
 from ._cached_property import cached_property
+from ._constants import FIELDS
+
+
+# cheap check for files that cannot have a setup() call
+REX_SETUP_CALL = re.compile(rb'\bsetup\s*\(')
 
 
 class StaticReader(BaseReader):
     @cached_property
     def content(self) -> Dict[str, Any]:
-        if not self.call:
+        stat = self.path.stat()
+        content = _read_content(type(self), str(self.path.resolve()), stat.st_mtime_ns, stat.st_size)  # type: ignore
+        # the cached dict is shared, don't let the caller modify it
+        return deepcopy(content)
+
+    def _get_content(self) -> Dict[str, Any]:
+        if not REX_SETUP_CALL.search(self.source) or not self.call:
             raise LookupError('cannot find setup()')
-        result = self._get_call_kwargs(self.call)
-        return self._clean(result)
+        return self._clean(self._extract_all)
 
     @cached_property
-    def tree(self) -> tuple:
-        return tuple(ast.parse(self.path.read_text(encoding='utf8')).body)
+    def _extract_all(self) -> Dict[str, Any]:
+        result = dict()
+        for name in FIELDS:
+            value = self._node_to_value(self._resolve_kw(name))
+            if value is None:
+                continue
+            result[name] = value
+        return result
 
     @cached_property
-    def call(self) -> Optional[ast.Call]:
-        return self._get_call(self.tree)
+    def source(self) -> bytes:
+        return self.path.read_bytes()
 
     @cached_property
-    def body(self) -> tuple:
-        return tuple(self._get_body(self.tree))
-
-    @classmethod
-    def _get_body(cls, elements):
-        for element in elements:
-            if isinstance(element, ast.FunctionDef):
-                yield from cls._get_body(element.body)
-                continue
-            if isinstance(element, ast.If):
-                yield from cls._get_body(element.body)
-            if isinstance(element, ast.Expr):
-                yield element.value
-                continue
-            yield element
+    def tree(self) -> Tuple[ast.stmt, ...]:
+        # ast.parse detects the source encoding (PEP 263) on its own
+        return tuple(ast.parse(self.source, filename=str(self.path)).body)
 
-    def _get_call(self, elements) -> Optional[ast.Call]:
-        for element in self._get_body(elements):
-            if not isinstance(element, ast.Call):
-                continue
+    @cached_property
+    def call(self) -> Optional[ast.Call]:
+        for element in self._indexed_body['calls']:
             if not isinstance(element.func, ast.Name):
                 continue
             if element.func.id != 'setup':
@@ -51,27 +58,73 @@ class StaticReader(BaseReader):
             return element
         return None
 
-    def _node_to_value(self, node):
+    @cached_property
+    def _call_kw(self) -> Dict[str, ast.expr]:
+        return {kw.arg: kw.value for kw in self.call.keywords if kw.arg is not None}
+
+    @cached_property
+    def _call_star_kwargs(self) -> Tuple[ast.expr, ...]:
+        return tuple(kw.value for kw in self.call.keywords if kw.arg is None)
+
+    @cached_property
+    def _star_kwargs(self) -> Dict[str, ast.expr]:
+        """keyword arguments passed into setup() through dict unpacking
+        """
+        result = dict()  # type: Dict[str, ast.expr]
+        for node in self._call_star_kwargs:
+            result.update(self._get_node_kwargs(node))
+        return result
+
+    def _resolve_kw(self, name: str) -> Optional[ast.expr]:
+        node = self._call_kw.get(name)
+        if node is None:
+            node = self._star_kwargs.get(name)
+        return node
+
+    @cached_property
+    def _indexed_body(self) -> Dict[str, Any]:
+        """calls and assignments of the module, including ones in functions and if-blocks
+        """
+        calls = []  # type: List[ast.Call]
+        assigns = dict()  # type: Dict[str, ast.expr]
+        stack = list(reversed(self.tree))  # type: List[ast.stmt]
+        while stack:
+            element = stack.pop()
+            if isinstance(element, (ast.FunctionDef, ast.If)):
+                stack.extend(reversed(element.body))
+            elif isinstance(element, ast.Expr):
+                if isinstance(element.value, ast.Call):
+                    calls.append(element.value)
+            elif isinstance(element, ast.Assign):
+                for target in element.targets:
+                    if isinstance(target, ast.Name):
+                        # the first assignment wins
+                        assigns.setdefault(target.id, element.value)
+        return dict(calls=calls, assigns=assigns)
+
+    def _node_to_value(self, node: Optional[ast.AST]) -> Any:
         if node is None:
             return None
-        if hasattr(ast, 'Constant'):
+        if sys.version_info >= (3, 8):
             if isinstance(node, ast.Constant):
                 return node.value
-        if isinstance(node, ast.Str):
-            return node.s
-        if isinstance(node, ast.Num):
-            return node.n
+        else:
+            # ast.Str and ast.Num are deprecated aliases of ast.Constant since 3.8
+            if isinstance(node, ast.Str):
+                return node.s
+            if isinstance(node, ast.Num):
+                return node.n
 
         if isinstance(node, ast.List):
             return [self._node_to_value(subnode) for subnode in node.elts]
         if isinstance(node, ast.Dict):
-            result = dict()
-            for key, value in zip(node.keys, node.values):
-                result[self._node_to_value(key)] = self._node_to_value(value)
-            return result
+            return {
+                self._node_to_value(key): self._node_to_value(value)
+                for key, value in zip(node.keys, node.values)
+            }
 
         if isinstance(node, ast.Name):
-            variable = self._find_variable_in_body(self.body, node.id)
+            variable = self._find_variable(node.id)
             if variable is not None:
                 return self._node_to_value(variable)
 
@@ -83,29 +136,48 @@ class StaticReader(BaseReader):
             return self._get_call_kwargs(node)
         return None
 
-    def _find_variable_in_body(self, body, name):
-        for elem in body:
-            if not isinstance(elem, ast.Assign):
-                continue
-            for target in elem.targets:
-                if not isinstance(target, ast.Name):
+    def _find_variable(self, name: str) -> Optional[ast.expr]:
+        return self._indexed_body['assigns'].get(name)
+
+    def _get_node_kwargs(self, node: Optional[ast.AST]) -> Dict[str, ast.expr]:
+        """value nodes by keys of a dict literal, a dict() call, or a variable with one of them
+        """
+        result = dict()  # type: Dict[str, ast.expr]
+        if isinstance(node, ast.Name):
+            return self._get_node_kwargs(self._find_variable(node.id))
+
+        if isinstance(node, ast.Dict):
+            for key, value in zip(node.keys, node.values):
+                # dict unpacking
+                if key is None:
+                    result.update(self._get_node_kwargs(value))
                     continue
-                if target.id == name:
-                    return elem.value
-        return None
+                name = self._node_to_value(key)
+                if isinstance(name, str):
+                    result[name] = value
+            return result
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'dict':
+            for keyword in node.keywords:
+                # dict unpacking
+                if keyword.arg is None:
+                    result.update(self._get_node_kwargs(keyword.value))
+                    continue
+                result[keyword.arg] = keyword.value
+        return result
 
     def _get_call_kwargs(self, node: ast.Call) -> Dict[str, Any]:
         result = dict()
-        for keyword in node.keywords:
-            # dict unpacking
-            if keyword.arg is None:
-                value = self._node_to_value(keyword.value)
-                if isinstance(value, dict):
-                    result.update(value)
-                continue
-            # keyword argument
-            value = self._node_to_value(keyword.value)
+        for name, subnode in self._get_node_kwargs(node).items():
+            value = self._node_to_value(subnode)
             if value is None:
                 continue
-            result[keyword.arg] = value
+            result[name] = value
         return result
+
+
+@lru_cache(maxsize=256)
+def _read_content(reader: Type[StaticReader], path: str, mtime: int, size: int) -> Dict[str, Any]:
+    """parse setup.py once per process and reader class while the file is unchanged
+    """
+    return reader(path)._get_content()
@@ -0,0 +1,35 @@
+"""A worker that reads setup.py files for CommandReader.
+
+It gets an absolute path to setup.py per input line and answers
+with a line of JSON: `{"result": metadata}` or `{"error": message}`.
+"""
+# built-in
+import json
+import os
+from pathlib import Path
+
+# app
+from ._cmd import get_setup_data
+
+
+def main() -> int:
+    # keep stdin and stdout for the protocol only,
+    # setup.py can read or print something on its own.
+    requests = os.fdopen(os.dup(0), 'r')
+    responses = os.fdopen(os.dup(1), 'w')
+    with open(os.devnull, 'r') as devnull:
+        os.dup2(devnull.fileno(), 0)
+    os.dup2(2, 1)
+
+    for line in requests:
+        try:
+            response = json.dumps({'result': get_setup_data(Path(line.rstrip('\n')))})
+        # setup.py can raise anything, report it instead of stopping the worker
+        except (Exception, SystemExit) as e:  # noqa: B902
+            response = json.dumps({'error': '{}: {}'.format(type(e).__name__, e)})
+        print(response, file=responses, flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
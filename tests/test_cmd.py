@@ -2,7 +2,11 @@
 from pathlib import Path
 
 # project
-from dephell_setuptools import CommandReader
+from dephell_setuptools import CommandReader, _cmd
+
+
+def _broken_worker(reader):
+    raise RuntimeError('worker has died')
 
 
 def test_cfg():
@@ -12,3 +16,33 @@ def test_cfg():
     assert actual['version'] == '2.10.0.dev0'
     reqs = ['jinja2', 'PyYAML', 'paramiko', 'cryptography', 'setuptools']
     assert actual['install_requires'] == reqs
+
+
+def test_subprocess_fallback(monkeypatch):
+    monkeypatch.setattr(CommandReader, '_run_in_worker', _broken_worker)
+    path = Path(__file__).parent / 'setups' / 'ansible' / 'setup.py'
+    actual = CommandReader(path).content
+    assert actual['name'] == 'ansible'
+    assert actual['version'] == '2.10.0.dev0'
+
+
+def test_worker_reuse():
+    path = Path(__file__).parent / 'setups' / 'ansible' / 'setup.py'
+    assert CommandReader(path)._run_in_worker()['name'] == 'ansible'
+    worker = _cmd._worker
+    assert CommandReader(path)._run_in_worker()['name'] == 'ansible'
+    assert _cmd._worker is worker
+
+
+def test_subprocess_trailing_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(CommandReader, '_run_in_worker', _broken_worker)
+    path = tmp_path / 'setup.py'
+    path.write_text('\n'.join([
+        'from setuptools import setup',
+        'print("build started")',
+        'setup(name="p1", version="1.0")',
+        'print("build finished")',
+    ]))
+    actual = CommandReader(path).content
+    assert actual['name'] == 'p1'
+    assert actual['version'] == '1.0'
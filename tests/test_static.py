@@ -1,8 +1,12 @@
 # built-in
 from pathlib import Path
 
+# external
+import pytest
+
 # project
 from dephell_setuptools import StaticReader
+from dephell_setuptools._static import _read_content
 
 
 def test_unpack_kwargs():
@@ -53,3 +57,51 @@ def test_requests():
         'socks:sys_platform == "win32" and python_version == "2.7"': ['win_inet_pton'],
     }
     assert actual['extras_require'] == extras
+
+
+def test_no_setup_call(tmp_path):
+    path = tmp_path / 'setup.py'
+    path.write_text('from setuptools import setup\n')
+    with pytest.raises(LookupError):
+        StaticReader(path).content
+
+    reader = StaticReader(path)
+    with pytest.raises(LookupError):
+        reader._get_content()
+    assert 'tree' not in vars(reader)
+
+
+def test_content_cache(tmp_path):
+    path = tmp_path / 'setup.py'
+    path.write_text('setup(name="first")\n')
+    assert StaticReader(path).content == {'name': 'first'}
+
+    # the result is cached until the file changes
+    hits = _read_content.cache_info().hits
+    assert StaticReader(path).content == {'name': 'first'}
+    assert _read_content.cache_info().hits == hits + 1
+    path.write_text('setup(name="second")\n')
+    assert StaticReader(path).content == {'name': 'second'}
+
+
+def test_nested_unpack_kwargs(tmp_path):
+    path = tmp_path / 'setup.py'
+    path.write_text('\n'.join([
+        'base = {"name": "nested", "version": "0.1.0"}',
+        'setup(**{**base, "version": "1.0.0"}, license="MIT")',
+    ]))
+    actual = StaticReader(path).content
+    assert actual == {'name': 'nested', 'version': '1.0.0', 'license': 'MIT'}
+
+
+def test_content_cache_subclass(tmp_path):
+    class UpperReader(StaticReader):
+        def _get_content(self):
+            content = super()._get_content()
+            content['name'] = content['name'].upper()
+            return content
+
+    path = tmp_path / 'setup.py'
+    path.write_text('setup(name="lower")\n')
+    assert StaticReader(path).content == {'name': 'lower'}
+    assert UpperReader(path).content == {'name': 'LOWER'}